@@ -10,11 +10,18 @@ Usage:
 """
 from __future__ import annotations
 import argparse
+import errno
 import logging
+import mmap
+import queue
+import re
 import sys
 import os
 import shutil
+import struct
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Tuple, List, Iterable
 
@@ -23,10 +30,25 @@ try:
 except Exception:
     exifread = None  # may be None; we'll try exiftool as fallback
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # non-Linux; reflink cloning unavailable
+
 DEFAULT_EXTENSIONS = ["jpg", "jpeg", "heic", "cr2", "nef", "arw", "raf", "dng", "png"]
 
+# Formats exifread reads the whole header on before (usually) failing;
+# cheaper to hand them straight to exiftool.
+EXIFTOOL_FIRST_EXTENSIONS = frozenset(["cr2", "nef", "arw", "raf", "dng", "heic"])
+
 logger = logging.getLogger("photo-renamer")
 
+# exiftool emits the keys in the order we request them, so the first match
+# already honours the DateTimeOriginal > CreateDate > DateTime priority.
+_EXIFTOOL_DATE_RE = re.compile(
+    rb'"(?:DateTimeOriginal|CreateDate|DateTime)"\s*:\s*"(\d{4}:\d\d:\d\d \d\d:\d\d:\d\d)'
+)
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Rename photos using EXIF date")
@@ -59,108 +81,368 @@ def parse_args() -> argparse.Namespace:
         default=",".join(DEFAULT_EXTENSIONS),
         help=f"Comma-separated list of file extensions to process. Default: {','.join(DEFAULT_EXTENSIONS)}",
     )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker threads for EXIF extraction. Default: min(32, 4*CPU count); lower this on HDDs",
+    )
+    p.add_argument(
+        "--maxprocs",
+        type=int,
+        default=None,
+        help="Maximum number of parallel exiftool processes. Default: CPU count (consider lowering on HDDs)",
+    )
     p.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
     return p.parse_args()
 
 
-def iter_candidates(paths: Iterable[str], recursive: bool, extset: set) -> Iterable[str]:
+def iter_candidates(
+    paths: Iterable[str],
+    recursive: bool,
+    extset: set,
+    dir_index: Optional[dict] = None,
+) -> Iterable[Tuple[str, Optional[os.DirEntry]]]:
+    # str.endswith against a tuple is a single C-level pass over the name's
+    # tail; splitext/rpartition allocate intermediate strings per entry.
+    suffixes = tuple("." + e for e in extset)
+
+    # os.scandir reuses the d_type returned by readdir, so is_file()/is_dir()
+    # below cost no extra stat syscall per entry (unlike os.walk/os.listdir
+    # plus os.path.isfile, which stat each file again).
+    # Yield the DirEntry alongside the path: its stat() caches, so a later
+    # mtime lookup for --use-filetime doesn't need a second stat syscall.
+    # scan() is only ever handed absolute directories (the root is resolved
+    # once below), so entry.path is already absolute and no per-entry
+    # abspath — with its getcwd call apiece — is needed.
+    def scan(directory: str) -> Iterable[Tuple[str, Optional[os.DirEntry]]]:
+        # Record every entry name while we are here anyway, so collision
+        # probing later never has to stat the filesystem for this directory.
+        names = None
+        if dir_index is not None:
+            names = dir_index.setdefault(directory, set())
+        with os.scandir(directory) as it:
+            for entry in it:
+                if names is not None:
+                    names.add(entry.name)
+                if entry.is_file(follow_symlinks=False):
+                    if entry.name.lower().endswith(suffixes):
+                        yield entry.path, entry
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    yield from scan(entry.path)
+
     for p in paths:
         if os.path.isfile(p):
-            if os.path.splitext(p)[1].lstrip(".").lower() in extset:
-                yield os.path.abspath(p)
+            if p.lower().endswith(suffixes):
+                yield os.path.abspath(p), None
             else:
                 logger.debug("Skipping file (extension not in set): %s", p)
         elif os.path.isdir(p):
-            if recursive:
-                for root, dirs, files in os.walk(p):
-                    for fn in files:
-                        if os.path.splitext(fn)[1].lstrip(".").lower() in extset:
-                            yield os.path.abspath(os.path.join(root, fn))
-            else:
-                for fn in os.listdir(p):
-                    full = os.path.join(p, fn)
-                    if os.path.isfile(full) and os.path.splitext(full)[1].lstrip(".").lower() in extset:
-                        yield os.path.abspath(full)
+            yield from scan(os.path.abspath(p))
         else:
             logger.warning("Path not found or unsupported: %s", p)
 
 
+def _parse_exif_datetime(val: str) -> Optional[datetime]:
+    """
+    Parse an EXIF "YYYY:MM:DD HH:MM:SS" string by integer slicing.
+
+    datetime.strptime re-parses the format string and takes the locale
+    lock on every call; for this fixed shape plain int() slices are an
+    order of magnitude cheaper. Falls back to strptime for anything that
+    doesn't slice cleanly.
+    """
+    try:
+        return datetime(
+            int(val[0:4]), int(val[5:7]), int(val[8:10]),
+            int(val[11:13]), int(val[14:16]), int(val[17:19]),
+        )
+    except ValueError:
+        try:
+            return datetime.strptime(val[:19], "%Y:%m:%d %H:%M:%S")
+        except ValueError:
+            return None
+
+
+def parse_exif_date_fast(path: str) -> Optional[datetime]:
+    """
+    Minimal JPEG APP1/TIFF scanner for DateTimeOriginal (tag 0x9003).
+
+    exifread decodes every tag into IfdTag objects when we only need one
+    19-byte ASCII field; walking the markers by hand does far less
+    interpreter work and allocation per file. Returns None for non-JPEG
+    input or on any parse problem so the general readers take over.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            buf = os.read(fd, 65536)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+    if len(buf) < 12 or buf[0:2] != b"\xff\xd8":
+        return None  # not a JPEG (SOI missing)
+    try:
+        # Walk markers looking for APP1 "Exif\0\0"; EXIF always precedes SOS.
+        pos = 2
+        tiff = -1
+        while pos + 4 <= len(buf):
+            if buf[pos] != 0xFF:
+                return None
+            marker = buf[pos + 1]
+            if marker == 0xDA:  # SOS: image data, no EXIF block found
+                return None
+            seg_len = struct.unpack_from(">H", buf, pos + 2)[0]
+            if marker == 0xE1 and buf[pos + 4 : pos + 10] == b"Exif\x00\x00":
+                tiff = pos + 10
+                break
+            pos += 2 + seg_len
+        if tiff < 0:
+            return None
+        byte_order = buf[tiff : tiff + 2]
+        if byte_order == b"II":
+            u16, u32 = "<H", "<I"
+        elif byte_order == b"MM":
+            u16, u32 = ">H", ">I"
+        else:
+            return None
+
+        def ifd_entries(offset: int):
+            # Each entry: tag(2) + type(2) + count(4) + value/offset(4).
+            n = struct.unpack_from(u16, buf, tiff + offset)[0]
+            base = tiff + offset + 2
+            for i in range(n):
+                entry = base + 12 * i
+                tag = struct.unpack_from(u16, buf, entry)[0]
+                typ = struct.unpack_from(u16, buf, entry + 2)[0]
+                val = struct.unpack_from(u32, buf, entry + 8)[0]
+                yield tag, typ, val
+
+        ifd0 = struct.unpack_from(u32, buf, tiff + 4)[0]
+        exif_ifd = None
+        for tag, typ, val in ifd_entries(ifd0):
+            if tag == 0x8769:  # ExifIFD pointer
+                exif_ifd = val
+                break
+        if exif_ifd is not None:
+            for tag, typ, val in ifd_entries(exif_ifd):
+                if tag == 0x9003 and typ == 2:  # DateTimeOriginal, ASCII
+                    raw = buf[tiff + val : tiff + val + 19].decode("ascii")
+                    return _parse_exif_datetime(raw)
+    except Exception as e:
+        logger.debug("Fast EXIF scan failed on %s: %s", path, e)
+    return None
+
+
 def parse_exif_date_exifread(path: str) -> Optional[datetime]:
     if exifread is None:
         return None
     try:
+        # stop_tag is matched against the bare tag name, so "UNDEF" never
+        # matched and exifread walked every IFD; stopping at DateTimeOriginal
+        # halts the parse right after the tag we want. Handing exifread an
+        # mmap instead of the file handle turns its many small seek/read
+        # calls into page-cache accesses with no syscall each.
         with open(path, "rb") as fh:
-            tags = exifread.process_file(fh, stop_tag="UNDEF", details=False)
+            if os.fstat(fh.fileno()).st_size == 0:
+                return None  # mmap rejects empty files
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                tags = exifread.process_file(mm, stop_tag="DateTimeOriginal", details=False)
+            finally:
+                mm.close()
         # Common tags:
         for tag in ("EXIF DateTimeOriginal", "EXIF DateTimeDigitized", "Image DateTime"):
             if tag in tags:
                 val = str(tags[tag])
                 # format "YYYY:MM:DD HH:MM:SS"
-                try:
-                    dt = datetime.strptime(val, "%Y:%m:%d %H:%M:%S")
+                dt = _parse_exif_datetime(val)
+                if dt:
                     return dt
-                except Exception:
-                    logger.debug("Failed parsing EXIF tag %s='%s' for %s", tag, val, path)
+                logger.debug("Failed parsing EXIF tag %s='%s' for %s", tag, val, path)
     except Exception as e:
         logger.debug("exifread failed on %s: %s", path, e)
     return None
 
 
-def parse_exif_date_exiftool(path: str) -> Optional[datetime]:
+class ExifToolDaemon:
     """
-    Ask exiftool for DateTimeOriginal or CreateDate or FileModifyDate.
-    Requires exiftool in PATH.
+    A single long-lived ``exiftool -stay_open True`` process.
+
+    Spawning a new exiftool per file pays the Perl interpreter startup
+    (~300 ms) every time; keeping one process alive and streaming
+    filenames over its stdin amortises that cost across the whole batch.
+    Requires exiftool in PATH; if it is missing, parse_date() simply
+    returns None.
     """
-    try:
-        proc = subprocess.run(
-            ["exiftool", "-DateTimeOriginal", "-CreateDate", "-DateTime", "-j", path],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if proc.returncode != 0:
-            logger.debug("exiftool returned non-zero for %s: %s", path, proc.stderr.strip())
-        out = proc.stdout.strip()
-        if not out:
-            return None
-        import json
 
+    def __init__(self) -> None:
+        self._proc: Optional[subprocess.Popen] = None
+        self._counter = 0
         try:
-            data = json.loads(out)
-            if not data or not isinstance(data, list):
-                return None
-            info = data[0]
-            for key in ("DateTimeOriginal", "CreateDate", "DateTime"):
-                if key in info and info[key]:
-                    val = info[key]
-                    # exiftool outputs "YYYY:MM:DD HH:MM:SS" or "YYYY:MM:DD HH:MM:SS+TZ"
-                    val = val.split("+")[0].split("-")[0].strip()
-                    try:
-                        dt = datetime.strptime(val, "%Y:%m:%d %H:%M:%S")
-                        return dt
-                    except Exception:
-                        logger.debug("exiftool returned unparsable date '%s' for %s", val, path)
+            self._proc = subprocess.Popen(
+                ["exiftool", "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            logger.debug("exiftool not found in PATH")
         except Exception as e:
-            logger.debug("Failed to parse exiftool json output for %s: %s", path, e)
-    except FileNotFoundError:
-        logger.debug("exiftool not found in PATH")
-    except Exception as e:
-        logger.debug("exiftool error for %s: %s", path, e)
-    return None
+            logger.debug("Failed to start exiftool daemon: %s", e)
+
+    @property
+    def available(self) -> bool:
+        return self._proc is not None
 
+    def parse_date(self, path: str) -> Optional[datetime]:
+        """
+        Ask exiftool for DateTimeOriginal or CreateDate or DateTime.
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            return None
+        self._counter += 1
+        sentinel = f"{{ready{self._counter}}}".encode()
+        cmd = (
+            f"-j\n-DateTimeOriginal\n-CreateDate\n-DateTime\n{path}\n"
+            f"-execute{self._counter}\n"
+        ).encode()
+        try:
+            self._proc.stdin.write(cmd)
+            self._proc.stdin.flush()
+            chunks = []
+            while True:
+                line = self._proc.stdout.readline()
+                if not line:
+                    logger.debug("exiftool daemon exited while reading %s", path)
+                    return None
+                if line.strip() == sentinel:
+                    break
+                chunks.append(line)
+        except Exception as e:
+            logger.debug("exiftool daemon error for %s: %s", path, e)
+            return None
+        # The output is ~200 bytes of JSON with a known shape; scanning for
+        # the date keys directly skips tokenizing a list-of-dict we would
+        # throw away anyway (the regex also strips any trailing timezone).
+        # Keep scanning past unparsable values: cameras commonly emit a
+        # zeroed DateTimeOriginal with a valid CreateDate after it.
+        for m in _EXIFTOOL_DATE_RE.finditer(b"".join(chunks)):
+            val = m.group(1).decode("ascii")
+            dt = _parse_exif_datetime(val)
+            if dt:
+                return dt
+            logger.debug("exiftool returned unparsable date '%s' for %s", val, path)
+        return None
 
-def get_image_datetime(path: str, use_filetime: bool) -> Optional[datetime]:
-    dt = parse_exif_date_exifread(path)
-    if dt:
-        logger.debug("Parsed EXIF using exifread: %s -> %s", path, dt.isoformat())
-        return dt
-    dt2 = parse_exif_date_exiftool(path)
-    if dt2:
-        logger.debug("Parsed EXIF using exiftool: %s -> %s", path, dt2.isoformat())
-        return dt2
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.write(b"-stay_open\nFalse\n")
+            self._proc.stdin.flush()
+            self._proc.wait(timeout=5)
+        except Exception:
+            self._proc.kill()
+        self._proc = None
+
+
+class ExifToolPool:
+    """
+    A pool of up to ``max_daemons`` ExifToolDaemon processes shared
+    between worker threads.
+
+    One stay_open exiftool tops out at roughly a single CPU, so batches
+    that lean on the fallback path scale with one daemon per core.
+    Daemons are spawned lazily and handed out through a queue, so
+    concurrent callers never share a process's pipes.
+    """
+
+    def __init__(self, max_daemons: Optional[int] = None) -> None:
+        self.size = max(1, max_daemons or os.cpu_count() or 1)
+        self._spawned = 0
+        self._unavailable = False
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[ExifToolDaemon]" = queue.Queue()
+        self._all: List[ExifToolDaemon] = []
+
+    def _acquire(self) -> Optional[ExifToolDaemon]:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._unavailable:
+                return None
+            if self._spawned < self.size:
+                daemon = ExifToolDaemon()
+                if not daemon.available:
+                    self._unavailable = True
+                    return None
+                self._spawned += 1
+                self._all.append(daemon)
+                return daemon
+        return self._idle.get()
+
+    def parse_date(self, path: str) -> Optional[datetime]:
+        daemon = self._acquire()
+        if daemon is None:
+            return None
+        try:
+            return daemon.parse_date(path)
+        finally:
+            self._idle.put(daemon)
+
+    def close(self) -> None:
+        with self._lock:
+            self._unavailable = True
+            for daemon in self._all:
+                daemon.close()
+            self._all.clear()
+
+
+def get_image_datetime(
+    path: str,
+    use_filetime: bool,
+    exiftool: Optional[ExifToolPool] = None,
+    entry: Optional[os.DirEntry] = None,
+) -> Optional[datetime]:
+    # Route by extension: raw/HEIC try exiftool before exifread (which
+    # reads their whole header before usually failing), and PNGs (which
+    # almost never carry EXIF) skip both readers.
+    ext = path.rpartition(".")[2].lower()
+    if ext != "png":
+        exiftool_first = ext in EXIFTOOL_FIRST_EXTENSIONS
+        if exiftool_first:
+            dt = exiftool.parse_date(path) if exiftool is not None else None
+            if dt:
+                logger.debug("Parsed EXIF using exiftool: %s -> %s", path, dt.isoformat())
+                return dt
+        else:
+            dt = parse_exif_date_fast(path)
+            if dt:
+                logger.debug("Parsed EXIF using fast scanner: %s -> %s", path, dt.isoformat())
+                return dt
+        # exifread still handles TIFF-based raw (CR2/NEF/DNG), so it stays
+        # a fallback even when exiftool went first (or isn't installed).
+        dt = parse_exif_date_exifread(path)
+        if dt:
+            logger.debug("Parsed EXIF using exifread: %s -> %s", path, dt.isoformat())
+            return dt
+        if not exiftool_first:
+            dt2 = exiftool.parse_date(path) if exiftool is not None else None
+            if dt2:
+                logger.debug("Parsed EXIF using exiftool: %s -> %s", path, dt2.isoformat())
+                return dt2
     if use_filetime:
         try:
-            ts = os.path.getmtime(path)
+            # Prefer the DirEntry's cached stat over a fresh getmtime syscall.
+            if entry is not None:
+                ts = entry.stat(follow_symlinks=False).st_mtime
+            else:
+                ts = os.stat(path).st_mtime
             dt3 = datetime.fromtimestamp(ts)
             logger.debug("Using file mtime as fallback: %s -> %s", path, dt3.isoformat())
             return dt3
@@ -169,26 +451,171 @@ def get_image_datetime(path: str, use_filetime: bool) -> Optional[datetime]:
     return None
 
 
-def unique_target_path(directory: str, base_name: str, ext: str) -> str:
-    candidate = os.path.join(directory, f"{base_name}.{ext}")
-    if not os.path.exists(candidate):
-        return candidate
-    # append counter
-    counter = 1
+def unique_target_path(
+    directory: str,
+    base_name: str,
+    ext: str,
+    dir_index: Optional[dict] = None,
+    counter_cache: Optional[dict] = None,
+) -> str:
+    # Probe against the name set captured during the scandir pass instead of
+    # stat-ing the filesystem per candidate; reserving the chosen name in the
+    # set also keeps two same-timestamp files from planning the same target.
+    names = dir_index.get(directory) if dir_index is not None else None
+    if names is not None and (os.sep in base_name or (os.altsep and os.altsep in base_name)):
+        # --format may contain path separators (e.g. "%Y/%m%d-%H%M%S"), in
+        # which case the candidate targets a subdirectory the name set does
+        # not cover; only a real filesystem probe can detect collisions there.
+        names = None
+
+    def taken(name: str) -> bool:
+        if names is not None:
+            return name in names
+        # directory wasn't scanned (user passed the file directly)
+        return os.path.exists(os.path.join(directory, name))
+
+    # Burst-mode shots share a timestamp; remembering the next free counter
+    # per (directory, base, ext) makes each collision probe O(1) amortized
+    # instead of re-walking 1..N for every duplicate.
+    key = (directory, base_name, ext)
+    counter = counter_cache.get(key, 0) if counter_cache is not None else 0
     while True:
-        candidate = os.path.join(directory, f"{base_name}_{counter}.{ext}")
-        if not os.path.exists(candidate):
-            return candidate
+        # counter 0 is the bare name; collisions append _1, _2, ...
+        candidate = f"{base_name}.{ext}" if counter == 0 else f"{base_name}_{counter}.{ext}"
+        if not taken(candidate):
+            break
         counter += 1
+    if names is not None:
+        names.add(candidate)
+    if counter_cache is not None:
+        counter_cache[key] = counter + 1
+    return os.path.join(directory, candidate)
 
 
-def rename_file(src: str, dst: str, simulate: bool = False) -> None:
+FICLONE = 0x40049409  # linux/fs.h: share extents with another file
+
+
+def _clone_file(src: str, dst: str) -> None:
+    """
+    Copy src to dst inside the kernel: a FICLONE reflink where the target
+    filesystem supports it (XFS/Btrfs; instant, shares extents), else
+    copy_file_range, which never buffers the data through userspace.
+    Raises OSError when neither mechanism works.
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    dst_fd = -1
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return
+            except OSError:
+                pass  # filesystem has no reflink support
+        if not hasattr(os, "copy_file_range"):
+            raise OSError(errno.ENOSYS, "copy_file_range unavailable")
+        remaining = os.fstat(src_fd).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src_fd, dst_fd, remaining)
+            if copied == 0:
+                raise OSError(errno.EIO, "copy_file_range made no progress")
+            remaining -= copied
+    except BaseException:
+        if dst_fd >= 0:
+            os.close(dst_fd)
+            dst_fd = -1
+            try:
+                os.unlink(dst)
+            except OSError:
+                pass
+        raise
+    finally:
+        os.close(src_fd)
+        if dst_fd >= 0:
+            os.close(dst_fd)
+
+
+def rename_file(src: str, dst: str, simulate: bool = False) -> str:
+    # Returns the log line instead of printing: the caller batches lines
+    # into one stdout write per chunk rather than one locked, line-buffered
+    # write per file.
     if simulate:
-        print(f"SIMULATE: {src} -> {dst}")
-        return
-    os.makedirs(os.path.dirname(dst), exist_ok=True)
-    shutil.move(src, dst)
-    print(f"RENAMED: {src} -> {dst}")
+        return f"SIMULATE: {src} -> {dst}"
+    if os.path.dirname(src) == os.path.dirname(dst):
+        # The common case: EXIF renames stay in the same directory, so a
+        # bare rename syscall suffices; shutil.move would add stat checks
+        # and a copy+unlink path we never need here.
+        os.rename(src, dst)
+    else:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                # Cross-device move: try a kernel-side clone before letting
+                # shutil.move fall back to a userspace copy2 + unlink.
+                try:
+                    _clone_file(src, dst)
+                    os.unlink(src)
+                except OSError:
+                    shutil.move(src, dst)
+            else:
+                raise
+    return f"RENAMED: {src} -> {dst}"
+
+
+def plan(
+    files: List[str],
+    dates: Iterable[Optional[datetime]],
+    args: argparse.Namespace,
+    dir_index: dict,
+    failures: List[Tuple[str, str]],
+) -> Iterable[Tuple[str, str]]:
+    """
+    Lazily yield (src, target) pairs for files whose date could be
+    determined, appending skipped/errored files to failures.
+    """
+    fmt = args.format
+    # Rebind hot globals to locals: LOAD_FAST beats LOAD_GLOBAL+LOAD_ATTR,
+    # and this loop runs once per file across the whole batch.
+    _dirname = os.path.dirname
+    _basename = os.path.basename
+    _splitext = os.path.splitext
+    _intern = sys.intern
+    _unique = unique_target_path
+    # Deduplicate directory/extension strings: thousands of files share a
+    # handful of distinct values, and we'd otherwise hold a fresh copy of
+    # each one per file.
+    dir_cache: dict = {}
+    ext_cache: dict = {}
+    counter_cache: dict = {}
+    for src, dt in zip(files, dates):
+        try:
+            if not dt:
+                logger.warning("No date found for %s (skipping)", src)
+                failures.append((src, "no-date"))
+                continue
+            base = dt.strftime(fmt)
+            d = _dirname(src)
+            directory = dir_cache.get(d)
+            if directory is None:
+                directory = dir_cache[d] = _intern(d)
+            e = _splitext(src)[1].lstrip(".")
+            ext = ext_cache.get(e)
+            if ext is None:
+                ext = ext_cache[e] = _intern(e)
+            # A file already named for its timestamp is a no-op by
+            # construction (target lives in src's own directory), so no
+            # abspath round-trips — or a pointless collision probe against
+            # the file's own name — are needed to detect it.
+            if _splitext(_basename(src))[0] == base:
+                logger.info("Source and target are same for %s (skipping)", src)
+                continue
+            target = _unique(directory, base, ext, dir_index, counter_cache)
+            yield src, target
+        except Exception as e:
+            logger.exception("Failed processing %s: %s", src, e)
+            failures.append((src, str(e)))
 
 
 def main():
@@ -196,7 +623,9 @@ def main():
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(levelname)s: %(message)s")
 
     extset = set(e.strip().lower() for e in args.extensions.split(",") if e.strip())
-    files = list(iter_candidates(args.paths, args.recursive, extset))
+    dir_index: dict = {}
+    candidates = list(iter_candidates(args.paths, args.recursive, extset, dir_index))
+    files = [path for path, _ in candidates]
     if not files:
         logger.info("No files found matching extensions: %s", ", ".join(sorted(extset)))
         return 0
@@ -206,46 +635,49 @@ def main():
     mapping: List[Tuple[str, str]] = []
     failures: List[Tuple[str, str]] = []
 
-    for src in files:
-        try:
-            dt = get_image_datetime(src, args.use_filetime)
-            if not dt:
-                logger.warning("No date found for %s (skipping)", src)
-                failures.append((src, "no-date"))
-                continue
-            base = dt.strftime(args.format)
-            directory = os.path.dirname(src)
-            ext = os.path.splitext(src)[1].lstrip(".")
-            target = unique_target_path(directory, base, ext)
-            if os.path.abspath(src) == os.path.abspath(target):
-                logger.info("Source and target are same for %s (skipping)", src)
-                continue
-            mapping.append((src, target))
-        except Exception as e:
-            logger.exception("Failed processing %s: %s", src, e)
-            failures.append((src, str(e)))
+    # EXIF extraction is I/O-bound and independent per file, so overlap the
+    # disk reads across a thread pool (exifread releases the GIL in read()).
+    jobs = args.jobs or min(32, (os.cpu_count() or 1) * 4)
+    exiftool = ExifToolPool(args.maxprocs)
+    try:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(files))) as ex:
+            dates = ex.map(
+                lambda c: get_image_datetime(c[0], args.use_filetime, exiftool, c[1]),
+                candidates,
+                chunksize=16,
+            )
+            # Plan and rename in one streaming pass: renames of early files
+            # overlap with EXIF extraction of later ones, and we never hold
+            # more than the summary accumulator in memory.
+            log_buffer: List[str] = []
+            for src, target in plan(files, dates, args, dir_index, failures):
+                mapping.append((src, target))
+                try:
+                    log_buffer.append(rename_file(src, target, simulate=args.simulate))
+                    if len(log_buffer) >= 1024:
+                        sys.stdout.write("\n".join(log_buffer) + "\n")
+                        log_buffer.clear()
+                except Exception as e:
+                    logger.exception("Failed renaming %s -> %s: %s", src, target, e)
+                    failures.append((src, str(e)))
+    finally:
+        exiftool.close()
+    if log_buffer:
+        sys.stdout.write("\n".join(log_buffer) + "\n")
 
     if not mapping:
         logger.info("Nothing to rename.")
         return 0
 
-    # show summary
-    print("Planned renames:")
-    for s, t in mapping:
-        print(f"{s} -> {t}")
+    # show summary (one buffered write; per-line print takes the stdio
+    # lock and flushes for every file)
+    if args.verbose:
+        sys.stdout.write("Planned renames:\n" + "\n".join(f"{s} -> {t}" for s, t in mapping) + "\n")
 
     if args.simulate:
         print("Simulation mode; no files renamed.")
         return 0
 
-    # Execute renames
-    for s, t in mapping:
-        try:
-            rename_file(s, t, simulate=False)
-        except Exception as e:
-            logger.exception("Failed renaming %s -> %s: %s", s, t, e)
-            failures.append((s, str(e)))
-
     if failures:
         logger.warning("Some files were not processed. Count: %d", len(failures))
         for f, reason in failures: